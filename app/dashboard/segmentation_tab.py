@@ -5,7 +5,6 @@ import seaborn as sns
 import numpy as np
 
 from segmentation.inference import segment_customers
-from segmentation.profiling import cluster_profile_summary
 
 
 def segmentation_tab():
@@ -33,7 +32,7 @@ def segmentation_tab():
 
     # Run segmentation
     try:
-        segmented_df = segment_customers(df)
+        segmented_df, summary = segment_customers(df, return_summary=True)
     except Exception as e:
         st.error(f"❌ Segmentation error:\n{e}")
         return
@@ -43,12 +42,27 @@ def segmentation_tab():
 
     # ---------------------------------------------------------
     # ✅ PCA Scatter Plot (Compact)
+    # Density of all rows + stratified sample of points per cluster
     # ---------------------------------------------------------
     st.subheader("📊 PCA Cluster Visualization")
 
+    density = summary["density"]
+    total_density = density["grids"].sum(axis=0)
+
     fig, ax = plt.subplots(figsize=(4.5, 3.5))
+    ax.imshow(
+        np.log1p(total_density.T),
+        origin="lower",
+        extent=[
+            density["x_edges"][0], density["x_edges"][-1],
+            density["y_edges"][0], density["y_edges"][-1]
+        ],
+        aspect="auto",
+        cmap="Greys",
+        alpha=0.6
+    )
     sns.scatterplot(
-        data=segmented_df,
+        data=summary["sample"],
         x="pca_x",
         y="pca_y",
         hue="cluster",
@@ -64,7 +78,7 @@ def segmentation_tab():
     # ✅ Cluster Profile Summary
     # ---------------------------------------------------------
     st.subheader("📈 Cluster Profile Summary")
-    profile = cluster_profile_summary(segmented_df)
+    profile = summary["profile"]
     st.dataframe(profile)
 
     # ---------------------------------------------------------
@@ -72,7 +86,7 @@ def segmentation_tab():
     # ---------------------------------------------------------
     st.subheader("🥧 Cluster Distribution")
 
-    cluster_counts = segmented_df["cluster"].value_counts().sort_index()
+    cluster_counts = summary["cluster_sizes"]
 
     fig, ax = plt.subplots(figsize=(3.5, 3.5))
     ax.pie(
@@ -90,8 +104,7 @@ def segmentation_tab():
     # ---------------------------------------------------------
     st.subheader("📊 Cluster-wise Feature Comparison")
 
-    numeric_cols = segmented_df.select_dtypes(include=["int64", "float64"]).columns
-    numeric_cols = [c for c in numeric_cols if c not in ["pca_x", "pca_y"]]
+    numeric_cols = list(profile.columns)
 
     group_size = 4
     feature_groups = [
@@ -108,20 +121,20 @@ def segmentation_tab():
                 with target_col:
                     st.write(f"### 🔹 {feature}")
 
+                    means = profile[feature]
+
                     fig, ax = plt.subplots(figsize=(4.5, 3))
-                    sns.barplot(
-                        data=segmented_df,
-                        x="cluster",
-                        y=feature,
-                        palette="tab10",
-                        estimator=np.mean,
-                        ax=ax
+                    ax.bar(
+                        means.index.astype(str),
+                        means.values,
+                        color=sns.color_palette("tab10", len(means))
                     )
+                    ax.set_xlabel("cluster")
+                    ax.set_ylabel(feature)
                     ax.set_title(f"Avg {feature} per Cluster", fontsize=10)
                     plt.tight_layout()
                     st.pyplot(fig, bbox_inches="tight")
 
-                    means = segmented_df.groupby("cluster")[feature].mean()
                     best_cluster = means.idxmax()
                     st.info(f"📌 **Cluster {best_cluster} has the highest {feature} ({means.max():.2f}).**")
 
@@ -130,7 +143,7 @@ def segmentation_tab():
     # ---------------------------------------------------------
     st.subheader("🕸️ Radar Chart: Cluster Characteristics")
 
-    clusters = sorted(segmented_df["cluster"].unique())
+    clusters = list(summary["cluster_sizes"].index)
     icons = ["🔥", "🌟", "⚡", "🌙", "🌈", "💎", "🚀", "🎯", "💠", "⭐"]
 
     # ✅ CSS for tile styling
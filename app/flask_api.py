@@ -8,55 +8,82 @@ ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 sys.path.append(ROOT_DIR)
 
 from utils.preprocess_fraud import preprocess_input
+from monitoring.monitor import get_monitor
+from utils.profiler import profile_run, stage
 
 app = Flask(__name__)
 
 # -----------------------------
 # Load trained model
 # -----------------------------
-with open(os.path.join(ROOT_DIR, "models", "fraud_detection_model.pkl"), "rb") as f:
-    model = pickle.load(f)
+with profile_run("flask_startup"), stage("load"):
+    with open(os.path.join(ROOT_DIR, "models", "fraud_detection_model.pkl"), "rb") as f:
+        model = pickle.load(f)
+
+# Drift monitor (no-op until models/fraud_monitoring_baseline.json exists)
+fraud_monitor = get_monitor("fraud")
 
 # -----------------------------
 # Prediction Endpoint
 # -----------------------------
 @app.route("/predict", methods=["POST"])
+@profile_run("flask_predict")
 def predict():
     try:
         # 1. Read JSON input
         data = request.get_json()
 
         # 2. Apply preprocessing
-        X = preprocess_input(data)
+        with stage("preprocess"):
+            X = preprocess_input(data)
 
-        # 3. Align schema if needed
-        if hasattr(model, "feature_names_in_"):
-            expected = list(model.feature_names_in_)
-            # Add missing columns with 0
-            for col in expected:
-                if col not in X.columns:
-                    X[col] = 0
-            # Drop extras
-            X = X[expected]
+            # 3. Align schema if needed
+            if hasattr(model, "feature_names_in_"):
+                expected = list(model.feature_names_in_)
+                # Add missing columns with 0
+                for col in expected:
+                    if col not in X.columns:
+                        X[col] = 0
+                # Drop extras
+                X = X[expected]
 
         # 4. Predict
-        if hasattr(model, "predict_proba"):
-            pred_proba = model.predict_proba(X)[0][1]
-        else:
-            # fallback if model has no predict_proba
-            pred_proba = float(model.predict(X)[0])
+        with stage("predict"):
+            if hasattr(model, "predict_proba"):
+                pred_proba = model.predict_proba(X)[0][1]
+            else:
+                # fallback if model has no predict_proba
+                pred_proba = float(model.predict(X)[0])
+
+            pred_class = int(pred_proba >= 0.5)
 
-        pred_class = int(pred_proba >= 0.5)
+        # Update drift sketches (raw inputs + score)
+        with stage("monitoring"):
+            if isinstance(data, dict):
+                fraud_monitor.observe_record(data)
+            fraud_monitor.observe("fraud_probability", pred_proba)
 
         # 5. Return response
-        return jsonify({
-            "fraud_probability": float(pred_proba),
-            "fraud_flag": pred_class
-        })
+        with stage("output"):
+            response = jsonify({
+                "fraud_probability": float(pred_proba),
+                "fraud_flag": pred_class
+            })
+        return response
 
     except Exception as e:
         return jsonify({"error": str(e)}), 400
 
+# -----------------------------
+# Drift Monitoring Endpoint
+# -----------------------------
+@app.route("/monitoring/drift", methods=["GET"])
+def drift():
+    return jsonify({
+        "fraud": fraud_monitor.report(),
+        "segmentation": get_monitor("segmentation").report()
+    })
+
 # -----------------------------
 # Run the API
 # -----------------------------
@@ -3,6 +3,8 @@ import joblib
 from sklearn.decomposition import PCA
 
 from utils.preprocess_fraud import preprocess_input
+from monitoring.monitor import get_monitor
+from utils.profiler import profile_run, stage
 
 # Paths
 ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
@@ -36,6 +38,7 @@ def load_fraud_artifacts():
     )
 
 
+@profile_run("predict_fraud")
 def predict_fraud(df):
     """
     Run fraud detection on new data.
@@ -44,22 +47,31 @@ def predict_fraud(df):
     ✅ Multi-row DataFrame
     """
 
-    model, scaler, numerical_cols, categorical_cols, dummy_columns = load_fraud_artifacts()
+    with stage("load"):
+        model, scaler, numerical_cols, categorical_cols, dummy_columns = load_fraud_artifacts()
 
     # ✅ Preprocess using shared function
-    X = preprocess_input(df)
+    with stage("preprocess"):
+        X = preprocess_input(df)
 
     # ✅ Apply PCA (reduce to 10 components)
-    pca = PCA(n_components=10, random_state=42)
-    X = pca.fit_transform(X)
+    with stage("pca"):
+        pca = PCA(n_components=10, random_state=42)
+        X = pca.fit_transform(X)
 
     # Predict
-    predictions = model.predict(X)
-    probabilities = model.predict_proba(X)[:, 1]
+    with stage("predict"):
+        predictions = model.predict(X)
+        probabilities = model.predict_proba(X)[:, 1]
 
-    # Build output
-    df_out = df.copy()
-    df_out["fraud_prediction"] = predictions
-    df_out["fraud_probability"] = probabilities.round(4)
+    with stage("output"):
+        # Build output
+        df_out = df.copy()
+        df_out["fraud_prediction"] = predictions
+        df_out["fraud_probability"] = probabilities.round(4)
+
+    # Drift monitoring (inputs + scores)
+    with stage("monitoring"):
+        get_monitor("fraud").observe_frame(df_out.drop(columns=["fraud_prediction"]))
 
     return df_out
\ No newline at end of file
@@ -0,0 +1,385 @@
+import os
+import json
+import glob
+import time
+import socket
+import threading
+import uuid
+from datetime import datetime, timezone
+from pathlib import Path
+
+from monitoring.sketches import (
+    NumericSketch,
+    CategoricalSketch,
+    sketch_from_dict,
+    population_stability_index,
+)
+
+
+# Root paths
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+MODEL_DIR = os.path.join(ROOT_DIR, "models")
+
+# Live sketches from every scoring process (Flask, Streamlit, batch jobs)
+LIVE_DIR = os.path.join(MODEL_DIR, "monitoring_live")
+
+PSI_MODERATE = 0.1
+PSI_DRIFT = 0.25
+
+# Live sketches are flushed to disk at most this often per process
+FLUSH_INTERVAL_S = 30
+
+# Snapshots not updated for this long (e.g. from dead processes) are dropped
+SNAPSHOT_MAX_AGE_S = 24 * 60 * 60
+
+
+def baseline_path(name, model_dir=MODEL_DIR):
+    return os.path.join(model_dir, f"{name}_monitoring_baseline.json")
+
+
+def _process_id():
+    return f"{socket.gethostname()}_{os.getpid()}"
+
+
+def build_baseline(df, numeric_cols, categorical_cols, bins=10, max_categories=50):
+    """
+    Build baseline sketches from training data.
+    Scores (e.g. fraud_probability) and cluster labels can be passed as
+    extra numeric / categorical columns of `df`.
+    """
+    streams = {}
+
+    for col in numeric_cols:
+        streams[col] = NumericSketch.from_values(df[col], bins=bins).to_dict()
+
+    for col in categorical_cols:
+        streams[col] = CategoricalSketch.from_values(df[col], max_categories=max_categories).to_dict()
+
+    return {
+        "created_at": datetime.now(timezone.utc).isoformat(),
+        "n_rows": int(len(df)),
+        "streams": streams,
+    }
+
+
+def save_baseline(baseline, name, save_path="../models"):
+    """Save a baseline snapshot next to the other model artifacts."""
+    Path(save_path).mkdir(exist_ok=True)
+
+    with open(baseline_path(name, save_path), "w") as f:
+        json.dump(baseline, f)
+
+    print(f"{name} monitoring baseline saved successfully!")
+
+
+class DriftMonitor:
+    """
+    Live sketches for one model, compared against its training baseline.
+    Updates are O(1) per value and memory is fixed by the baseline bins.
+
+    Each process periodically flushes its sketches to LIVE_DIR, and
+    report() merges every process's file, so the Flask endpoint also
+    sees traffic scored by the Streamlit dashboard or batch jobs.
+    A shared epoch file lets reset(all_processes=True) clear every process.
+    """
+
+    def __init__(self, name, baseline=None, live_dir=LIVE_DIR,
+                 flush_interval=FLUSH_INTERVAL_S, max_age=SNAPSHOT_MAX_AGE_S):
+        self.name = name
+        self.baseline = baseline
+        self.baseline_streams = {}
+        self.streams = {}
+        self.n_observed = 0
+        self.live_dir = live_dir
+        self.flush_interval = flush_interval
+        self.max_age = max_age
+        self._dirty = False
+        # First update flushes right away; later ones are throttled
+        self._last_flush = time.monotonic() - flush_interval
+        self._flush_timer = None
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+
+        if baseline is not None:
+            for key, data in baseline["streams"].items():
+                sketch = sketch_from_dict(data)
+                self.baseline_streams[key] = sketch
+                self.streams[key] = sketch.empty_copy()
+
+        self._epoch = self._read_epoch()
+
+    @property
+    def enabled(self):
+        return bool(self.streams)
+
+    def live_path(self, process_id=None):
+        return os.path.join(self.live_dir, f"{self.name}_{process_id or _process_id()}.json")
+
+    def epoch_path(self):
+        return os.path.join(self.live_dir, f"{self.name}.epoch")
+
+    def observe(self, key, value):
+        """Record one value for a single stream (ignored if not in the baseline)."""
+        with self._lock:
+            sketch = self.streams.get(key)
+            if sketch is not None:
+                sketch.update(value)
+                self._dirty = True
+
+        self._maybe_flush()
+
+    def observe_record(self, record):
+        """Record every baselined field of a single request payload (dict)."""
+        if not self.streams:
+            return
+
+        with self._lock:
+            self.n_observed += 1
+            self._dirty = True
+            for key, value in record.items():
+                sketch = self.streams.get(key)
+                if sketch is not None:
+                    sketch.update(value)
+
+        self._maybe_flush()
+
+    def observe_frame(self, df):
+        """Record every baselined column of a DataFrame in vectorized passes."""
+        if not self.streams:
+            return
+
+        # Cheap next to a batch; per-record updates only catch a reset at flush time
+        self._sync_epoch()
+
+        with self._lock:
+            self.n_observed += len(df)
+            self._dirty = True
+            for key in df.columns:
+                sketch = self.streams.get(key)
+                if sketch is not None:
+                    sketch.update_many(df[key])
+
+        self._maybe_flush()
+
+    # -----------------------------
+    # SHARED LIVE STATE
+    # -----------------------------
+    def _maybe_flush(self):
+        """Flush at most once per interval; a timer picks up the trailing updates."""
+        if not self._dirty:
+            return
+
+        wait = self.flush_interval - (time.monotonic() - self._last_flush)
+        if wait <= 0:
+            self.flush()
+        elif self._flush_timer is None:
+            with self._lock:
+                if self._flush_timer is None:
+                    self._flush_timer = threading.Timer(wait, self._timed_flush)
+                    self._flush_timer.daemon = True
+                    self._flush_timer.start()
+
+    def _timed_flush(self):
+        self._flush_timer = None
+        if self._dirty:
+            self.flush()
+
+    def flush(self):
+        """Write this process's live sketches to LIVE_DIR (atomic replace)."""
+        if not self.enabled:
+            return
+
+        with self._flush_lock:
+            self._sync_epoch()
+
+            with self._lock:
+                snapshot = {
+                    "baseline_created_at": self.baseline.get("created_at"),
+                    "epoch": self._epoch,
+                    "updated_at": datetime.now(timezone.utc).isoformat(),
+                    "n_observed": self.n_observed,
+                    "streams": {
+                        key: {"counts": list(s.counts), "missing": s.missing}
+                        for key, s in self.streams.items()
+                    },
+                }
+                self._dirty = False
+                self._last_flush = time.monotonic()
+
+            # Monitoring must never break scoring, so I/O errors are only reported
+            path = self.live_path()
+            try:
+                Path(self.live_dir).mkdir(parents=True, exist_ok=True)
+                tmp_path = f"{path}.tmp"
+                with open(tmp_path, "w") as f:
+                    json.dump(snapshot, f)
+                os.replace(tmp_path, path)
+            except OSError as e:
+                print(f"⚠️ Could not flush {self.name} drift sketches: {e}")
+
+    def _read_epoch(self):
+        try:
+            with open(self.epoch_path(), "r") as f:
+                return f.read().strip() or None
+        except OSError:
+            return None
+
+    def _clear_local(self):
+        with self._lock:
+            self.streams = {k: s.empty_copy() for k, s in self.baseline_streams.items()}
+            self.n_observed = 0
+            self._dirty = False
+
+    def _sync_epoch(self):
+        """Drop local counts if another process reset all monitors since we last looked."""
+        epoch = self._read_epoch()
+        if epoch != self._epoch:
+            self._clear_local()
+            self._epoch = epoch
+
+    def _other_processes(self):
+        """Recent live snapshots flushed by other processes for the same baseline and epoch."""
+        own = self.live_path()
+        snapshots = []
+        now = datetime.now(timezone.utc)
+
+        for path in glob.glob(os.path.join(self.live_dir, f"{self.name}_*.json")):
+            if path == own:
+                continue
+            try:
+                with open(path, "r") as f:
+                    snapshot = json.load(f)
+            except (OSError, ValueError):
+                continue
+
+            # Snapshots taken against an older baseline have different bins
+            if snapshot.get("baseline_created_at") != self.baseline.get("created_at"):
+                continue
+            # Written before the last reset(all_processes=True)
+            if snapshot.get("epoch") != self._epoch:
+                continue
+
+            try:
+                age = (now - datetime.fromisoformat(snapshot["updated_at"])).total_seconds()
+            except (KeyError, TypeError, ValueError):
+                continue
+
+            if age > self.max_age:
+                # Stale (usually a process that has exited): age it out
+                try:
+                    os.remove(path)
+                except OSError:
+                    pass
+                continue
+
+            snapshots.append(snapshot)
+
+        return snapshots
+
+    def reset(self, all_processes=False):
+        """
+        Clear live sketches (baseline is kept). With all_processes=True a new
+        epoch is written, so every other process drops its counts on its next
+        flush and older snapshots are ignored by report().
+        """
+        if all_processes:
+            epoch = uuid.uuid4().hex
+            try:
+                Path(self.live_dir).mkdir(parents=True, exist_ok=True)
+                tmp_path = f"{self.epoch_path()}.tmp"
+                with open(tmp_path, "w") as f:
+                    f.write(epoch)
+                os.replace(tmp_path, self.epoch_path())
+            except OSError as e:
+                print(f"⚠️ Could not reset {self.name} drift sketches: {e}")
+                return
+            self._epoch = epoch
+
+        self._clear_local()
+
+        pattern = f"{self.name}_*.json" if all_processes else os.path.basename(self.live_path())
+        for path in glob.glob(os.path.join(self.live_dir, pattern)):
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+
+    def report(self):
+        """PSI per stream against the baseline, merged across all scoring processes."""
+        if not self.enabled:
+            return {
+                "model": self.name,
+                "baseline": False,
+                "message": f"No baseline found. Expected: {baseline_path(self.name)}",
+            }
+
+        self._sync_epoch()
+        others = self._other_processes()
+
+        with self._lock:
+            counts = {k: list(s.counts) for k, s in self.streams.items()}
+            missing = {k: s.missing for k, s in self.streams.items()}
+            n_observed = self.n_observed
+
+        for snapshot in others:
+            n_observed += snapshot.get("n_observed", 0)
+            for key, data in snapshot["streams"].items():
+                if key in counts and len(data["counts"]) == len(counts[key]):
+                    counts[key] = [a + b for a, b in zip(counts[key], data["counts"])]
+                    missing[key] += data.get("missing", 0)
+
+        streams = {}
+        for key, live_counts in counts.items():
+            psi = population_stability_index(self.baseline_streams[key].counts, live_counts)
+
+            if psi is None:
+                status = "no_data"
+            elif psi >= PSI_DRIFT:
+                status = "drift"
+            elif psi >= PSI_MODERATE:
+                status = "moderate"
+            else:
+                status = "stable"
+
+            streams[key] = {
+                "kind": self.baseline_streams[key].kind,
+                "psi": None if psi is None else round(psi, 4),
+                "status": status,
+                "count": int(sum(live_counts)),
+                "missing": missing[key],
+            }
+
+        return {
+            "model": self.name,
+            "baseline": True,
+            "baseline_created_at": self.baseline.get("created_at"),
+            "n_observed": n_observed,
+            "processes": 1 + len(others),
+            "drifted": sorted(k for k, s in streams.items() if s["status"] == "drift"),
+            "streams": streams,
+        }
+
+
+# -----------------------------
+# Process-wide monitors
+# -----------------------------
+_monitors = {}
+_monitors_lock = threading.Lock()
+
+
+def get_monitor(name):
+    """Return the shared monitor for `name`, loading its baseline on first use."""
+    monitor = _monitors.get(name)
+    if monitor is not None:
+        return monitor
+
+    with _monitors_lock:
+        if name not in _monitors:
+            path = baseline_path(name)
+            baseline = None
+            if os.path.exists(path):
+                with open(path, "r") as f:
+                    baseline = json.load(f)
+            _monitors[name] = DriftMonitor(name, baseline)
+
+    return _monitors[name]
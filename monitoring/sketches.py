@@ -0,0 +1,145 @@
+import math
+from bisect import bisect_right
+
+import numpy as np
+import pandas as pd
+
+
+OTHER_CATEGORY = "__other__"
+
+
+class NumericSketch:
+    """
+    Fixed-size histogram over bin edges frozen at training time.
+
+    Values below the first edge / above the last edge fall into the
+    outer buckets, so memory stays constant however much traffic is seen.
+    """
+
+    kind = "numeric"
+
+    def __init__(self, edges, counts=None):
+        self.edges = [float(e) for e in edges]
+        self.counts = list(counts) if counts is not None else [0] * (len(self.edges) + 1)
+        self.missing = 0
+
+    @classmethod
+    def from_values(cls, values, bins=10):
+        """Build a sketch whose edges are the quantiles of the baseline values."""
+        values = pd.to_numeric(pd.Series(values), errors="coerce").dropna().to_numpy(dtype="float64")
+        if len(values) == 0:
+            return cls([])
+
+        quantiles = np.linspace(0, 1, bins + 1)[1:-1]
+        edges = np.unique(np.quantile(values, quantiles))
+        sketch = cls(edges)
+        sketch.update_many(values)
+        return sketch
+
+    def update(self, value):
+        """Add a single value (hot path: pure Python, no numpy overhead)."""
+        try:
+            value = float(value)
+        except (TypeError, ValueError):
+            self.missing += 1
+            return
+
+        if math.isnan(value):
+            self.missing += 1
+            return
+
+        self.counts[bisect_right(self.edges, value)] += 1
+
+    def update_many(self, values):
+        """Add a batch of values in one vectorized pass."""
+        values = pd.to_numeric(pd.Series(values), errors="coerce").to_numpy(dtype="float64")
+        valid = values[~np.isnan(values)]
+        self.missing += int(len(values) - len(valid))
+
+        idx = np.searchsorted(self.edges, valid, side="right")
+        binned = np.bincount(idx, minlength=len(self.counts))
+        self.counts = [c + int(b) for c, b in zip(self.counts, binned)]
+
+    def empty_copy(self):
+        return NumericSketch(self.edges)
+
+    def to_dict(self):
+        return {"kind": self.kind, "edges": self.edges, "counts": self.counts}
+
+
+class CategoricalSketch:
+    """
+    Frequency table over the categories seen at training time.
+
+    Unseen categories are pooled into a single "__other__" bucket.
+    """
+
+    kind = "categorical"
+
+    def __init__(self, categories, counts=None):
+        self.categories = [str(c) for c in categories]
+        if OTHER_CATEGORY not in self.categories:
+            self.categories.append(OTHER_CATEGORY)
+
+        self.index = {c: i for i, c in enumerate(self.categories)}
+        self.other = self.index[OTHER_CATEGORY]
+        self.counts = list(counts) if counts is not None else [0] * len(self.categories)
+        self.missing = 0
+
+    @classmethod
+    def from_values(cls, values, max_categories=50):
+        """Build a sketch from the most frequent baseline categories."""
+        values = pd.Series(values).dropna().astype(str)
+        top = values.value_counts().index[:max_categories].tolist()
+        sketch = cls(top)
+        sketch.update_many(values)
+        return sketch
+
+    def update(self, value):
+        """Add a single value."""
+        if value is None or (isinstance(value, float) and math.isnan(value)):
+            self.missing += 1
+            return
+
+        self.counts[self.index.get(str(value), self.other)] += 1
+
+    def update_many(self, values):
+        """Add a batch of values."""
+        values = pd.Series(values)
+        valid = values.dropna().astype(str)
+        self.missing += int(len(values) - len(valid))
+
+        for category, count in valid.value_counts().items():
+            self.counts[self.index.get(category, self.other)] += int(count)
+
+    def empty_copy(self):
+        return CategoricalSketch(self.categories)
+
+    def to_dict(self):
+        return {"kind": self.kind, "categories": self.categories, "counts": self.counts}
+
+
+def sketch_from_dict(data):
+    """Rebuild a sketch saved with `to_dict`."""
+    if data["kind"] == NumericSketch.kind:
+        return NumericSketch(data["edges"], data["counts"])
+    if data["kind"] == CategoricalSketch.kind:
+        return CategoricalSketch(data["categories"], data["counts"])
+    raise ValueError(f"❌ Unknown sketch kind: {data['kind']}")
+
+
+def population_stability_index(expected_counts, actual_counts, eps=1e-4):
+    """
+    PSI between two bucketed distributions.
+    Rule of thumb: < 0.1 stable, 0.1–0.25 moderate shift, > 0.25 drift.
+    """
+    expected = np.asarray(expected_counts, dtype="float64")
+    actual = np.asarray(actual_counts, dtype="float64")
+
+    if expected.sum() == 0 or actual.sum() == 0:
+        return None
+
+    expected = np.clip(expected / expected.sum(), eps, None)
+    actual = np.clip(actual / actual.sum(), eps, None)
+
+    return float(np.sum((actual - expected) * np.log(actual / expected)))
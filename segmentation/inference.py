@@ -3,6 +3,11 @@ import json
 import joblib
 import pandas as pd
 
+from segmentation.profiling import ClusterProfileAccumulator
+from segmentation.visualization import build_visualization_summary
+from monitoring.monitor import get_monitor
+from utils.profiler import profile_run, stage
+
 
 # Compute absolute paths
 ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
@@ -51,17 +56,27 @@ def load_segmentation_artifacts():
 
 
 
-def segment_customers(df):
+@profile_run("segment_customers")
+def segment_customers(df, artifacts=None, return_summary=False):
     """
     Apply preprocessing, clustering, and PCA to new customer data.
     Returns a dataframe with:
     - cluster
     - pca_x
     - pca_y
+    With return_summary=True, returns (dataframe, visualization summary).
     """
+    return _segment_customers(df, artifacts=artifacts, return_summary=return_summary)
+
 
-    # Load artifacts safely
-    preprocessor, kmeans, pca, numeric_features, categorical_features = load_segmentation_artifacts()
+def _segment_customers(df, artifacts=None, return_summary=False):
+    """`segment_customers` without its own profiling run (stages join the caller's run)."""
+
+    # Load artifacts safely (callers processing many chunks can pass them in)
+    with stage("load"):
+        if artifacts is None:
+            artifacts = load_segmentation_artifacts()
+    preprocessor, kmeans, pca, numeric_features, categorical_features = artifacts
 
     # Ensure required columns exist
     required_cols = numeric_features + categorical_features
@@ -77,18 +92,64 @@ def segment_customers(df):
     df_input = df[required_cols].copy()
 
     # Preprocess
-    X_processed = preprocessor.transform(df_input)
+    with stage("preprocess"):
+        X_processed = preprocessor.transform(df_input)
 
     # Predict clusters
-    clusters = kmeans.predict(X_processed)
+    with stage("predict"):
+        clusters = kmeans.predict(X_processed)
 
     # PCA for visualization
-    pca_components = pca.transform(X_processed)
+    with stage("pca"):
+        pca_components = pca.transform(X_processed)
+
+    with stage("output"):
+        # Build output dataframe
+        df_output = df.copy()
+        df_output["cluster"] = clusters
+        df_output["pca_x"] = pca_components[:, 0]
+        df_output["pca_y"] = pca_components[:, 1]
+
+    # Drift monitoring (inputs + cluster assignments)
+    with stage("monitoring"):
+        get_monitor("segmentation").observe_frame(df_input.assign(cluster=clusters))
+
+    if return_summary:
+        with stage("visualization_summary"):
+            summary = build_visualization_summary(df_output)
+        return df_output, summary
+
+    return df_output
+
+
+def segment_customers_in_chunks(chunks, accumulator):
+    """
+    Segment customers chunk by chunk (e.g. pd.read_csv(..., chunksize=N)).
+    Yields each segmented chunk and updates `accumulator`
+    (a ClusterProfileAccumulator) as it goes, so cluster profiles can be
+    built without holding all rows in memory.
+    """
+
+    # No profiling run is opened here: it would leak to the caller at every
+    # yield. Wrap the loop in profile_run(...) (as profile_customers_in_chunks
+    # does) to collect the per-chunk stages in a single report.
+    with stage("load"):
+        artifacts = load_segmentation_artifacts()
+
+    for chunk in chunks:
+        segmented = _segment_customers(chunk, artifacts=artifacts)
+        with stage("cluster_profile"):
+            # Model features only: skips IDs, dates and free-text columns
+            accumulator.update(segmented, numeric_cols=artifacts[3], categorical_cols=artifacts[4])
+        yield segmented
+
+
+@profile_run("profile_customers_in_chunks")
+def profile_customers_in_chunks(chunks):
+    """Segment all chunks and return only the merged cluster profile accumulator."""
 
-    # Build output dataframe
-    df_output = df.copy()
-    df_output["cluster"] = clusters
-    df_output["pca_x"] = pca_components[:, 0]
-    df_output["pca_y"] = pca_components[:, 1]
+    accumulator = ClusterProfileAccumulator()
+    for _ in segment_customers_in_chunks(chunks, accumulator):
+        pass
 
-    return df_output
\ No newline at end of file
+    return accumulator
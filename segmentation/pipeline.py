@@ -1,30 +1,51 @@
+import os
+import sys
 import pandas as pd
 from preprocessing import fit_preprocessor
 from model import train_kmeans, train_pca, save_segmentation_models
 import json
 
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(ROOT_DIR)
 
+from monitoring.monitor import build_baseline, save_baseline
+from utils.profiler import profile_run, stage
+
+
+@profile_run("train_segmentation")
 def train_segmentation_pipeline(data_path="../data/insurance_synthetic.csv"):
     """Train full segmentation pipeline: preprocessing + KMeans + PCA."""
 
     # Load dataset
-    df = pd.read_csv(data_path)
+    with stage("load"):
+        df = pd.read_csv(data_path)
 
-    # Fit preprocessing and save artifacts
-    preprocessor = fit_preprocessor(df)
+    with stage("preprocess"):
+        # Fit preprocessing and save artifacts
+        preprocessor = fit_preprocessor(df)
 
-    # Transform data
-    metadata = json.load(open("../models/segmentation_features.json"))
-    numeric = metadata["numeric_features"]
-    categorical = metadata["categorical_features"]
+        # Transform data
+        metadata = json.load(open("../models/segmentation_features.json"))
+        numeric = metadata["numeric_features"]
+        categorical = metadata["categorical_features"]
 
-    X_processed = preprocessor.transform(df[numeric + categorical])
+        X_processed = preprocessor.transform(df[numeric + categorical])
 
     # Train models
-    kmeans = train_kmeans(X_processed, n_clusters=5)
-    pca = train_pca(X_processed)
+    with stage("fit"):
+        kmeans = train_kmeans(X_processed, n_clusters=5)
+
+    with stage("pca"):
+        pca = train_pca(X_processed)
+
+    with stage("output"):
+        # Save models
+        save_segmentation_models(kmeans, pca)
 
-    # Save models
-    save_segmentation_models(kmeans, pca)
+        # Save drift monitoring baseline (features + cluster assignments)
+        baseline_df = df[numeric + categorical].copy()
+        baseline_df["cluster"] = kmeans.labels_
+        baseline = build_baseline(baseline_df, numeric, categorical + ["cluster"])
+        save_baseline(baseline, "segmentation")
 
-    print("Full segmentation pipeline trained and saved successfully!")
\ No newline at end of file
+    print("Full segmentation pipeline trained and saved successfully!")
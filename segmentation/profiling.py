@@ -1,5 +1,15 @@
 import pandas as pd
 
+
+# pandas 3 stores text as "str" and deprecates selecting it via "object";
+# pandas 2 rejects "str" in select_dtypes
+CATEGORICAL_DTYPES = ["object", "category"]
+if int(pd.__version__.split(".")[0]) >= 3:
+    CATEGORICAL_DTYPES.append("str")
+
+OTHER_CATEGORY = "__other__"
+
+
 def cluster_profile_summary(df):
     """Generate summary statistics for each cluster."""
     numeric_cols = df.select_dtypes(include=["int64", "float64"]).columns.tolist()
@@ -8,4 +18,166 @@ def cluster_profile_summary(df):
     numeric_cols = [col for col in numeric_cols if col not in ["pca_x", "pca_y"]]
 
     profile = df.groupby("cluster")[numeric_cols].mean().round(2)
-    return profile
\ No newline at end of file
+    return profile
+
+
+class ClusterProfileAccumulator:
+    """
+    Streaming cluster profiler.
+
+    Keeps per-cluster running counts, means and variances for numeric
+    columns plus category frequency tables, so profiles can be built
+    chunk by chunk without holding the full dataset in memory.
+    Accumulators from parallel workers can be combined with `merge`.
+
+    Each category table keeps at most `max_categories` columns; rarer
+    values are pooled into "__other__" so memory stays bounded.
+    """
+
+    def __init__(self, cluster_col="cluster", exclude_cols=("pca_x", "pca_y"), max_categories=50):
+        self.cluster_col = cluster_col
+        self.exclude_cols = list(exclude_cols)
+        self.max_categories = max_categories
+
+        # Per-cluster x per-column state (index = cluster, columns = feature)
+        self.count = pd.DataFrame(dtype="float64")
+        self.mean = pd.DataFrame(dtype="float64")
+        self.m2 = pd.DataFrame(dtype="float64")
+
+        # Category frequency tables: column -> DataFrame (cluster x category)
+        self.category_counts = {}
+
+        # Number of rows seen per cluster
+        self.size = pd.Series(dtype="int64")
+
+    # -----------------------------
+    # UPDATE / MERGE
+    # -----------------------------
+    def update(self, df, numeric_cols=None, categorical_cols=None):
+        """
+        Add a chunk of segmented rows (must contain the cluster column).
+        Pass the model's feature lists to skip IDs, dates and other free-text
+        columns; otherwise columns are picked by dtype.
+        """
+        if self.cluster_col not in df.columns:
+            raise ValueError(f"❌ Missing '{self.cluster_col}' column in chunk")
+
+        if df.empty:
+            return self
+
+        skip = set(self.exclude_cols) | {self.cluster_col}
+        if numeric_cols is None:
+            numeric_cols = df.select_dtypes(include=["int64", "float64"]).columns
+        if categorical_cols is None:
+            categorical_cols = df.select_dtypes(include=CATEGORICAL_DTYPES).columns
+
+        numeric_cols = [col for col in numeric_cols if col not in skip]
+        categorical_cols = [col for col in categorical_cols if col not in skip]
+
+        grouped = df.groupby(self.cluster_col)
+
+        # Chunk-level moments, merged into the running state below
+        if numeric_cols:
+            count = grouped[numeric_cols].count().astype("float64")
+            mean = grouped[numeric_cols].mean()
+            m2 = grouped[numeric_cols].var(ddof=0) * count
+            self._merge_moments(count, mean, m2.fillna(0.0))
+
+        for col in categorical_cols:
+            table = pd.crosstab(df[self.cluster_col], df[col])
+            self._merge_categories(col, table)
+
+        self.size = self.size.add(grouped.size(), fill_value=0).astype("int64")
+        return self
+
+    def merge(self, other):
+        """Merge another accumulator (e.g. from a parallel worker) into this one."""
+        if other.cluster_col != self.cluster_col:
+            raise ValueError("❌ Cannot merge accumulators with different cluster columns")
+
+        if not other.count.empty:
+            self._merge_moments(other.count, other.mean, other.m2)
+
+        for col, table in other.category_counts.items():
+            self._merge_categories(col, table)
+
+        self.size = self.size.add(other.size, fill_value=0).astype("int64")
+        return self
+
+    def _merge_moments(self, count_b, mean_b, m2_b):
+        """Combine running moments using the parallel (Chan et al.) update."""
+        index = self.count.index.union(count_b.index)
+        columns = self.count.columns.union(count_b.columns, sort=False)
+
+        def align(frame):
+            return frame.reindex(index=index, columns=columns).fillna(0.0)
+
+        n_a, mean_a, m2_a = align(self.count), align(self.mean), align(self.m2)
+        n_b, mean_b, m2_b = align(count_b), align(mean_b), align(m2_b)
+
+        n = n_a + n_b
+        safe_n = n.where(n > 0)
+        delta = mean_b - mean_a
+
+        self.count = n
+        self.mean = (mean_a + delta * n_b / safe_n).fillna(0.0)
+        self.m2 = (m2_a + m2_b + delta ** 2 * n_a * n_b / safe_n).fillna(0.0)
+
+    def _merge_categories(self, col, table):
+        table = table.copy()
+        table.columns = table.columns.astype(str)
+
+        current = self.category_counts.get(col)
+        if current is not None:
+            table = current.add(table, fill_value=0).fillna(0)
+
+        self.category_counts[col] = self._cap_categories(table)
+
+    def _cap_categories(self, table):
+        """Keep the most frequent categories and pool the rest into "__other__"."""
+        if len(table.columns) <= self.max_categories:
+            return table
+
+        totals = table.drop(columns=[OTHER_CATEGORY], errors="ignore").sum()
+        keep = totals.sort_values(ascending=False).index[:self.max_categories - 1]
+        rest = [c for c in table.columns if c not in keep]
+
+        capped = table[list(keep)].copy()
+        capped[OTHER_CATEGORY] = table[rest].sum(axis=1)
+        return capped
+
+    # -----------------------------
+    # RESULTS
+    # -----------------------------
+    def profile(self):
+        """Per-cluster means, shaped like `cluster_profile_summary`."""
+        means = self.mean.where(self.count > 0)
+        means.index.name = self.cluster_col
+        return means.sort_index().round(2)
+
+    def variance(self, ddof=1):
+        """Per-cluster variances (sample variance by default)."""
+        denom = (self.count - ddof).where(self.count - ddof > 0)
+        variance = self.m2 / denom
+        variance.index.name = self.cluster_col
+        return variance.sort_index()
+
+    def std(self, ddof=1):
+        """Per-cluster standard deviations."""
+        return self.variance(ddof=ddof) ** 0.5
+
+    def cluster_sizes(self):
+        """Number of rows seen per cluster."""
+        sizes = self.size.sort_index()
+        sizes.index.name = self.cluster_col
+        return sizes
+
+    def category_frequencies(self, col, normalize=False):
+        """Category frequency table (cluster x category) for one column."""
+        if col not in self.category_counts:
+            raise KeyError(f"❌ No category counts recorded for column: {col}")
+
+        table = self.category_counts[col].fillna(0).astype("int64").sort_index()
+        if normalize:
+            return table.div(table.sum(axis=1), axis=0).round(4)
+        return table
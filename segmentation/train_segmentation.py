@@ -1,3 +1,21 @@
+import argparse
+
 from pipeline import train_segmentation_pipeline
+from utils.profiler import configure
+
+parser = argparse.ArgumentParser(description="Train the customer segmentation pipeline.")
+parser.add_argument("--profile", action="store_true",
+                    help="Record per-stage wall time, CPU time and peak memory (same as HIML_PROFILE=1)")
+parser.add_argument("--cprofile", action="store_true",
+                    help="Also dump a cProfile .prof file for the run (implies --profile)")
+parser.add_argument("--profile-dir", default=None,
+                    help="Directory for profiling reports (default: <root>/profiles)")
+args = parser.parse_args()
+
+configure(
+    enabled=True if args.profile else None,
+    cprofile=True if args.cprofile else None,
+    output_dir=args.profile_dir
+)
 
-train_segmentation_pipeline()
\ No newline at end of file
+train_segmentation_pipeline()
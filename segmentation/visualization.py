@@ -0,0 +1,64 @@
+import numpy as np
+import pandas as pd
+
+from segmentation.profiling import cluster_profile_summary
+
+
+def build_visualization_summary(df, sample_per_cluster=500, bins=50, random_state=42):
+    """
+    Build plot-ready data for segmented customers so dashboard render
+    time does not grow with the number of rows:
+    - sample: stratified random sample of points per cluster
+    - density: 2-D PCA histogram grid per cluster (shared bin edges)
+    - cluster_sizes: row count per cluster
+    - profile: per-cluster feature means
+    """
+
+    clusters = df["cluster"].to_numpy()
+    x = df["pca_x"].to_numpy(dtype="float64")
+    y = df["pca_y"].to_numpy(dtype="float64")
+    n = len(df)
+
+    labels, codes = np.unique(clusters, return_inverse=True)
+    sizes = np.bincount(codes, minlength=len(labels))
+
+    # -----------------------------
+    # STRATIFIED SAMPLE
+    # -----------------------------
+    # Sort by (cluster, random key) and keep the first k rows of each cluster
+    rng = np.random.default_rng(random_state)
+    order = np.lexsort((rng.random(n), codes))
+    sorted_codes = codes[order]
+    position = np.arange(n) - np.searchsorted(sorted_codes, sorted_codes, side="left")
+    keep = np.sort(order[position < sample_per_cluster])
+
+    sample = pd.DataFrame({
+        "pca_x": x[keep],
+        "pca_y": y[keep],
+        "cluster": clusters[keep]
+    })
+
+    # -----------------------------
+    # DENSITY GRIDS
+    # -----------------------------
+    x_edges = np.linspace(x.min(), x.max(), bins + 1) if n else np.linspace(0, 1, bins + 1)
+    y_edges = np.linspace(y.min(), y.max(), bins + 1) if n else np.linspace(0, 1, bins + 1)
+
+    x_bin = np.clip(np.searchsorted(x_edges, x, side="right") - 1, 0, bins - 1)
+    y_bin = np.clip(np.searchsorted(y_edges, y, side="right") - 1, 0, bins - 1)
+
+    # One bincount over (cluster, x_bin, y_bin) gives every cluster's grid
+    flat = (codes * bins + x_bin) * bins + y_bin
+    grids = np.bincount(flat, minlength=len(labels) * bins * bins).reshape(len(labels), bins, bins)
+
+    return {
+        "sample": sample,
+        "density": {
+            "clusters": labels.tolist(),
+            "x_edges": x_edges,
+            "y_edges": y_edges,
+            "grids": grids
+        },
+        "cluster_sizes": pd.Series(sizes, index=labels, name="count"),
+        "profile": cluster_profile_summary(df)
+    }
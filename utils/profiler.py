@@ -0,0 +1,318 @@
+"""
+Per-stage profiling for training, inference and the Flask API.
+
+Disabled by default. Enable with environment variables:
+    HIML_PROFILE=1            record wall time, CPU time and peak memory per stage
+    HIML_PROFILE_CPROFILE=1   also dump a cProfile .prof file per run
+    HIML_PROFILE_DIR=path     where reports are written (default: <root>/profiles)
+
+or call configure(...) (train_segmentation.py exposes --profile / --cprofile).
+
+Overlapping runs (e.g. concurrent Flask requests) still get wall/CPU time,
+but per-stage peak memory is left out of their reports, and only one run at
+a time gets a cProfile dump.
+
+Compare two run reports:
+    python -m utils.profiler diff old.json new.json
+"""
+
+import os
+import sys
+import json
+import time
+import cProfile
+import itertools
+import threading
+import tracemalloc
+import contextvars
+from contextlib import contextmanager
+from datetime import datetime
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+
+# Root paths
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+_TRUE = {"1", "true", "yes", "on"}
+
+_config = {
+    "enabled": os.environ.get("HIML_PROFILE", "").lower() in _TRUE,
+    "cprofile": os.environ.get("HIML_PROFILE_CPROFILE", "").lower() in _TRUE,
+    "output_dir": os.environ.get("HIML_PROFILE_DIR", os.path.join(ROOT_DIR, "profiles")),
+}
+
+_current_run = contextvars.ContextVar("himl_profile_run", default=None)
+
+# tracemalloc and cProfile are process-wide, but runs can overlap
+# (threaded Flask requests), so their use is coordinated here
+_runs_lock = threading.Lock()
+_active_runs = set()
+_cprofile_lock = threading.Lock()
+_run_ids = itertools.count()
+
+
+def configure(enabled=None, cprofile=None, output_dir=None):
+    """Override the environment settings (e.g. from CLI flags)."""
+    if enabled is not None:
+        _config["enabled"] = enabled
+    if cprofile is not None:
+        _config["cprofile"] = cprofile
+        if cprofile:
+            _config["enabled"] = True
+    if output_dir is not None:
+        _config["output_dir"] = output_dir
+
+
+def is_enabled():
+    return _config["enabled"]
+
+
+def _peak_rss_mb():
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is bytes on macOS, kilobytes on Linux
+    return round(peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024, 2)
+
+
+class ProfileRun:
+    """Stage timings for a single run (one training job, one request, ...)."""
+
+    def __init__(self, name):
+        self.name = name
+        self.stages = {}
+        self._peak_stack = []
+        # Set when another run overlaps: peaks are shared and no longer per-run
+        self.overlapped = False
+        self.cprofile_skipped = None
+        self.run_id = next(_run_ids)
+        self.started_at = datetime.now()
+        self._wall_start = time.perf_counter()
+        self._cpu_start = time.process_time()
+
+    def record(self, name, wall, cpu, peak):
+        entry = self.stages.setdefault(
+            name, {"calls": 0, "wall_s": 0.0, "cpu_s": 0.0, "peak_mem_mb": 0.0}
+        )
+        entry["calls"] += 1
+        entry["wall_s"] += wall
+        entry["cpu_s"] += cpu
+        entry["peak_mem_mb"] = max(entry["peak_mem_mb"], peak / (1024 * 1024))
+
+    def report(self):
+        report = {
+            "run": self.name,
+            "started_at": self.started_at.isoformat(timespec="seconds"),
+            "python": sys.version.split()[0],
+            "total": {
+                "wall_s": round(time.perf_counter() - self._wall_start, 4),
+                "cpu_s": round(time.process_time() - self._cpu_start, 4),
+            },
+            "peak_rss_mb": _peak_rss_mb(),
+            "stages": {
+                name: {
+                    "calls": s["calls"],
+                    "wall_s": round(s["wall_s"], 4),
+                    "cpu_s": round(s["cpu_s"], 4),
+                    "peak_mem_mb": None if self.overlapped else round(s["peak_mem_mb"], 2),
+                }
+                for name, s in self.stages.items()
+            },
+        }
+
+        if self.overlapped:
+            report["peak_mem_note"] = "not recorded: overlapped with another profiled run"
+        if self.cprofile_skipped:
+            report["cprofile_skipped"] = self.cprofile_skipped
+
+        return report
+
+
+class _Stage:
+    __slots__ = ("run", "name", "wall", "cpu")
+
+    def __init__(self, run, name):
+        self.run = run
+        self.name = name
+
+    def __enter__(self):
+        # Keep the enclosing stage's peak before resetting it for this one
+        stack = self.run._peak_stack
+        if stack:
+            stack[-1] = max(stack[-1], tracemalloc.get_traced_memory()[1])
+        stack.append(0)
+        tracemalloc.reset_peak()
+
+        self.wall = time.perf_counter()
+        self.cpu = time.process_time()
+        return self
+
+    def __exit__(self, *exc):
+        wall = time.perf_counter() - self.wall
+        cpu = time.process_time() - self.cpu
+
+        stack = self.run._peak_stack
+        peak = max(stack.pop(), tracemalloc.get_traced_memory()[1])
+        if stack:
+            stack[-1] = max(stack[-1], peak)
+
+        self.run.record(self.name, wall, cpu, peak)
+        return False
+
+
+class _NullStage:
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+_NULL_STAGE = _NullStage()
+
+
+def stage(name):
+    """Time a pipeline stage; no-op when profiling is off or no run is active."""
+    run = _current_run.get()
+    if run is None:
+        return _NULL_STAGE
+    return _Stage(run, name)
+
+
+@contextmanager
+def profile_run(name):
+    """
+    Profile one run and write its report when it finishes.
+    Nested runs (e.g. inference called from training) join the outer run.
+    Can also be used as a decorator.
+    """
+    if not _config["enabled"] or _current_run.get() is not None:
+        yield _current_run.get()
+        return
+
+    run = ProfileRun(name)
+    token = _current_run.set(run)
+
+    with _runs_lock:
+        if _active_runs:
+            run.overlapped = True
+            for other in _active_runs:
+                other.overlapped = True
+        _active_runs.add(run)
+
+        # Started once and left running: stopping it would break overlapping runs
+        if not tracemalloc.is_tracing():
+            tracemalloc.start()
+
+    profiler = _start_cprofile(run) if _config["cprofile"] else None
+
+    try:
+        yield run
+    finally:
+        if profiler is not None:
+            profiler.disable()
+            _cprofile_lock.release()
+
+        with _runs_lock:
+            _active_runs.discard(run)
+        _current_run.reset(token)
+
+        _write_report(run, profiler)
+
+
+def _start_cprofile(run):
+    """Only one cProfile can be active per process; overlapping runs skip it."""
+    if not _cprofile_lock.acquire(blocking=False):
+        run.cprofile_skipped = "another profiled run holds cProfile"
+        return None
+
+    profiler = cProfile.Profile()
+    try:
+        profiler.enable()
+    except ValueError as e:  # another profiler/tool already registered (3.12+)
+        _cprofile_lock.release()
+        run.cprofile_skipped = str(e)
+        return None
+
+    return profiler
+
+
+def _write_report(run, profiler):
+    # Profiling must never fail the run it measures, so I/O errors are only reported
+    try:
+        output_dir = _config["output_dir"]
+        os.makedirs(output_dir, exist_ok=True)
+
+        stem = os.path.join(
+            output_dir, f"{run.name}_{run.started_at:%Y%m%d_%H%M%S}_{os.getpid()}_{run.run_id}"
+        )
+        report = run.report()
+
+        if profiler is not None:
+            # Load with pstats, snakeviz, or flameprof/gprof2dot for a flamegraph
+            profiler.dump_stats(f"{stem}.prof")
+            report["cprofile"] = f"{stem}.prof"
+
+        with open(f"{stem}.json", "w") as f:
+            json.dump(report, f, indent=2)
+    except OSError as e:
+        print(f"⚠️ Could not write profiling report for {run.name}: {e}")
+
+
+def diff_reports(old, new):
+    """Per-stage deltas between two run reports (dicts or JSON paths)."""
+    if isinstance(old, str):
+        with open(old, "r") as f:
+            old = json.load(f)
+    if isinstance(new, str):
+        with open(new, "r") as f:
+            new = json.load(f)
+
+    rows = []
+    names = list(old["stages"]) + [s for s in new["stages"] if s not in old["stages"]]
+
+    for name in names + ["total"]:
+        a = old["total"] if name == "total" else old["stages"].get(name, {})
+        b = new["total"] if name == "total" else new["stages"].get(name, {})
+
+        row = {"stage": name}
+        for metric in ["wall_s", "cpu_s", "peak_mem_mb"]:
+            if metric not in a and metric not in b:
+                continue
+            before, after = a.get(metric), b.get(metric)
+            row[metric] = {"old": before, "new": after}
+            if before is not None and after is not None:
+                row[metric]["delta"] = round(after - before, 4)
+                if before:
+                    row[metric]["pct"] = round(100 * (after - before) / before, 1)
+        rows.append(row)
+
+    return rows
+
+
+def _format_diff(rows):
+    lines = [f"{'stage':<20}{'metric':<14}{'old':>12}{'new':>12}{'delta':>12}{'pct':>9}"]
+    for row in rows:
+        for metric, v in row.items():
+            if metric == "stage":
+                continue
+            pct = f"{v['pct']:+.1f}%" if "pct" in v else "-"
+            lines.append(
+                f"{row['stage']:<20}{metric:<14}{str(v['old']):>12}{str(v['new']):>12}"
+                f"{str(v.get('delta', '-')):>12}{pct:>9}"
+            )
+    return "\n".join(lines)
+
+
+if __name__ == "__main__":
+    if len(sys.argv) != 4 or sys.argv[1] != "diff":
+        print("Usage: python -m utils.profiler diff old.json new.json")
+        sys.exit(1)
+
+    print(_format_diff(diff_reports(sys.argv[2], sys.argv[3])))